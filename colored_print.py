@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import io, logging
+import sys, logging, functools
 import enum
 
 import common_util.env_variable as env
@@ -9,9 +9,19 @@ import typing
 # respect NO_COLOR and terminal property
 no_color = env.no_color()
 
+# messages below this level are discarded by the leveled *printf helpers
+enabled_level = logging.NOTSET
+
 def color_settings(force_color: bool = False):
-    global no_color
+    global no_color, _stdout_tty, _stderr_tty
     no_color = force_color
+    _stdout_tty = (sys.stdout, isatty(sys.stdout))
+    _stderr_tty = (sys.stderr, isatty(sys.stderr))
+
+def set_enabled_level(level: typing.Union[str, int]) -> int:
+    global enabled_level
+    enabled_level = __check_level(level)
+    return enabled_level
 
 def isatty(stream: typing.TextIO) -> bool:
     try:
@@ -19,6 +29,27 @@ def isatty(stream: typing.TextIO) -> bool:
     except AttributeError:
         return False
 
+# terminal property of stdout and stderr, rechecked only when sys.stdout or sys.stderr is replaced
+# (or by color_settings)
+_stdout_tty = (sys.stdout, isatty(sys.stdout))
+_stderr_tty = (sys.stderr, isatty(sys.stderr))
+
+def __stream_isatty(stream: typing.Optional[typing.TextIO]) -> bool:
+    global _stdout_tty, _stderr_tty
+    if stream is None:
+        stream = sys.stdout
+    if stream is _stdout_tty[0]:
+        return _stdout_tty[1]
+    if stream is _stderr_tty[0]:
+        return _stderr_tty[1]
+    if stream is sys.stdout:
+        _stdout_tty = (stream, isatty(stream))
+        return _stdout_tty[1]
+    if stream is sys.stderr:
+        _stderr_tty = (stream, isatty(stream))
+        return _stderr_tty[1]
+    return isatty(stream)
+
 class ANSICompose(enum.Enum):
     @staticmethod
     def compose(*args: ANSICompose | int | str) -> str:
@@ -32,9 +63,7 @@ class ANSICompose(enum.Enum):
         >  16-231:  6 * 6 * 6 cube (216 colors): 16 + 36 * r + 6 * g + b (0 ≤ r, g, b ≤ 5)
         > 232-255:  grayscale from dark to light in 24 steps
         """
-        if foreground:
-            return f"{ANSICompose.FORE_COLOR};5;{value}"
-        return f"{ANSICompose.BACK_COLOR};5;{value}"
+        return f"{_FG_256_PREFIX if foreground else _BG_256_PREFIX}{value}"
 
     @staticmethod
     def composeRGB(r: int, g: int, b: int, foreground: bool = True) -> str:
@@ -42,9 +71,7 @@ class ANSICompose(enum.Enum):
         2;{r};{g};{b} for RGB colors
         r, g, b should be in range 0-255
         """
-        if foreground:
-            return f"{ANSICompose.FORE_COLOR};2;{r};{g};{b}"
-        return f"{ANSICompose.BACK_COLOR};2;{r};{g};{b}"
+        return f"{_FG_RGB_PREFIX if foreground else _BG_RGB_PREFIX}{r};{g};{b}"
 
     def __str__(self) -> str:
         return str(self.value)
@@ -82,6 +109,13 @@ class ANSICompose(enum.Enum):
     BACK_COLOR   = 48
     BACK_TRANS   = 49
 
+
+# extended color prefixes, resolved once instead of formatting the enum members on every call
+_FG_256_PREFIX = f"{ANSICompose.FORE_COLOR};5;"
+_BG_256_PREFIX = f"{ANSICompose.BACK_COLOR};5;"
+_FG_RGB_PREFIX = f"{ANSICompose.FORE_COLOR};2;"
+_BG_RGB_PREFIX = f"{ANSICompose.BACK_COLOR};2;"
+
 class ANSIColors:
     BLACK   = ANSICompose.compose(ANSICompose.FORE_BLACK)
     RED     = ANSICompose.compose(ANSICompose.FORE_RED)
@@ -118,6 +152,15 @@ class ColoredPrintSetting:
     }
 
 
+# colors indexed by level, levels in between the standard ones (e.g. VERBOSE1) take the color of the
+# standard level below them, levels above CRITICAL take the color of CRITICAL
+_LEVEL_COLOR: tuple[typing.Optional[str], ...] = tuple(
+    ColoredPrintSetting.MSG_COLOR_DICT.get(level - level % 10)
+    for level in range(logging.CRITICAL + 1)
+)
+_LEVEL_COLOR_END = len(_LEVEL_COLOR)
+
+
 def annotate(properties: typing.Union[ANSICompose, list[ANSICompose]], text: str, force: bool = False) -> str:
     if no_color and not force:
         return text
@@ -132,66 +175,169 @@ def hprintf(ansi_color_str: typing.Union[ANSICompose, list[ANSICompose]], *args,
     return pprintf(ANSICompose.compose(*ansi_color_str), *args, **kwargs)
 
 
-def pprintf(ansi_color_str: typing.Union[str, ANSIColors], *args, **kwargs) -> None:
-    if no_color:
-        print(*args, **kwargs)
-    else:
-        output_str = io.StringIO()
-        with io.StringIO() as output_str:
-            print(*args, file=output_str, end="")
-            print(f"{ansi_color_str}{output_str.getvalue()}{ANSIColors.ENDC}", **kwargs)
-
-
-def cprintf(*args, **kwargs):
-    """Argument list same as print"""
-    return pprintf(
-        ColoredPrintSetting.MSG_COLOR_DICT[logging.CRITICAL], *args, **kwargs
-    )
-
-
-def eprintf(*args, **kwargs):
-    """Argument list same as print"""
-    return pprintf(
-        ColoredPrintSetting.MSG_COLOR_DICT[logging.ERROR], *args, **kwargs
-    )
+# encoded prefixes of the message colors, written straight to the stdout buffer by pprintf
+_PREFIX_B: dict[str, bytes] = {
+    color: color.encode() for color in ColoredPrintSetting.MSG_COLOR_DICT.values()
+}
+_ENDC_B = f"{ANSIColors.ENDC}\n".encode()
 
 
-def wprintf(*args, **kwargs):
-    """Argument list same as print"""
-    return pprintf(
-        ColoredPrintSetting.MSG_COLOR_DICT[logging.WARNING], *args, **kwargs
-    )
+def __fast_emit(prefix_b: bytes, text: str) -> None:
+    stream = sys.stdout
+    # text already queued by print must go out before the raw write
+    stream.flush()
+    stream.buffer.write(b"".join((prefix_b, text.encode(stream.encoding, stream.errors), _ENDC_B)))
+    stream.buffer.flush()
 
 
-def iprintf(*args, **kwargs):
-    """Argument list same as print"""
-    return pprintf(
-        ColoredPrintSetting.MSG_COLOR_DICT[logging.INFO], *args, **kwargs
-    )
-
-
-def dprintf(*args, **kwargs):
-    """Argument list same as print"""
-    return pprintf(
-        ColoredPrintSetting.MSG_COLOR_DICT[logging.DEBUG], *args, **kwargs
-    )
+def pprintf(ansi_color_str: typing.Union[str, ANSIColors], *args, **kwargs) -> None:
+    stream = kwargs.get("file")
+    # no escape codes for pipes and files
+    if no_color or not __stream_isatty(stream):
+        print(*args, **kwargs)
+        return
+    sep = kwargs.pop("sep", None)
+    sep = " " if sep is None else sep
+    text = sep.join(map(str, args))
+    prefix_b = _PREFIX_B.get(ansi_color_str)
+    if prefix_b is not None and not kwargs and hasattr(sys.stdout, "buffer"):
+        __fast_emit(prefix_b, text)
+    else:
+        print("".join((ansi_color_str, text, ANSIColors.ENDC)), **kwargs)
+
+
+def __level_printf(
+    level: int,
+    lazy: typing.Optional[typing.Callable[[], typing.Any]],
+    *args,
+    **kwargs,
+):
+    # discard before any argument is formatted (or produced, if lazy is given)
+    if level < enabled_level:
+        return None
+    color = None
+    if 0 <= level < _LEVEL_COLOR_END:
+        color = _LEVEL_COLOR[level]
+    elif level >= _LEVEL_COLOR_END:
+        color = _LEVEL_COLOR[-1]
+    if color is None:
+        raise KeyError(level)
+    if lazy is not None:
+        args = (*args, lazy())
+    return pprintf(color, *args, **kwargs)
+
+
+# the helpers below bind their color as a default argument and gate on the level inline, so a
+# message costs no lookup or extra call before reaching pprintf
+def cprintf(
+    *args,
+    lazy: typing.Optional[typing.Callable[[], typing.Any]] = None,
+    _color: str = ColoredPrintSetting.MSG_COLOR_DICT[logging.CRITICAL],
+    **kwargs,
+):
+    """
+    Argument list same as print. `lazy` is called only if the message will be printed, its result
+    is printed after the other arguments.
+    """
+    if logging.CRITICAL < enabled_level:
+        return None
+    if lazy is not None:
+        args = (*args, lazy())
+    return pprintf(_color, *args, **kwargs)
+
+
+def eprintf(
+    *args,
+    lazy: typing.Optional[typing.Callable[[], typing.Any]] = None,
+    _color: str = ColoredPrintSetting.MSG_COLOR_DICT[logging.ERROR],
+    **kwargs,
+):
+    """
+    Argument list same as print. `lazy` is called only if the message will be printed, its result
+    is printed after the other arguments.
+    """
+    if logging.ERROR < enabled_level:
+        return None
+    if lazy is not None:
+        args = (*args, lazy())
+    return pprintf(_color, *args, **kwargs)
+
+
+def wprintf(
+    *args,
+    lazy: typing.Optional[typing.Callable[[], typing.Any]] = None,
+    _color: str = ColoredPrintSetting.MSG_COLOR_DICT[logging.WARNING],
+    **kwargs,
+):
+    """
+    Argument list same as print. `lazy` is called only if the message will be printed, its result
+    is printed after the other arguments.
+    """
+    if logging.WARNING < enabled_level:
+        return None
+    if lazy is not None:
+        args = (*args, lazy())
+    return pprintf(_color, *args, **kwargs)
+
+
+def iprintf(
+    *args,
+    lazy: typing.Optional[typing.Callable[[], typing.Any]] = None,
+    _color: str = ColoredPrintSetting.MSG_COLOR_DICT[logging.INFO],
+    **kwargs,
+):
+    """
+    Argument list same as print. `lazy` is called only if the message will be printed, its result
+    is printed after the other arguments.
+    """
+    if logging.INFO < enabled_level:
+        return None
+    if lazy is not None:
+        args = (*args, lazy())
+    return pprintf(_color, *args, **kwargs)
+
+
+def dprintf(
+    *args,
+    lazy: typing.Optional[typing.Callable[[], typing.Any]] = None,
+    _color: str = ColoredPrintSetting.MSG_COLOR_DICT[logging.DEBUG],
+    **kwargs,
+):
+    """
+    Argument list same as print. `lazy` is called only if the message will be printed, its result
+    is printed after the other arguments.
+    """
+    if logging.DEBUG < enabled_level:
+        return None
+    if lazy is not None:
+        args = (*args, lazy())
+    return pprintf(_color, *args, **kwargs)
+
+
+@functools.lru_cache(maxsize=16)
+def __level_from_name(level: str) -> int:
+    if level not in logging._nameToLevel:
+        raise ValueError("Unknown level: %r" % level)
+    return logging._nameToLevel[level]
 
 
 def __check_level(level: typing.Union[str, int]) -> int:
     # copying logging._checkLevel
     if isinstance(level, int):
-        rv = level
-    elif str(level) == level:
-        if level not in logging._nameToLevel:
-            raise ValueError("Unknown level: %r" % level)
-        rv = logging._nameToLevel[level]
-    else:
-        raise TypeError("Level not an integer or a valid string: %r" % (level,))
-    return rv
-
-
-def lprintf(level: typing.Union[str, int], *args, **kwargs):
-    """First arg is logging level Argument list same as print"""
-    return pprintf(
-        ColoredPrintSetting.MSG_COLOR_DICT[__check_level(level)], *args, **kwargs
-    )
+        return level
+    if str(level) == level:
+        return __level_from_name(level)
+    raise TypeError("Level not an integer or a valid string: %r" % (level,))
+
+
+def lprintf(
+    level: typing.Union[str, int],
+    *args,
+    lazy: typing.Optional[typing.Callable[[], typing.Any]] = None,
+    **kwargs,
+):
+    """
+    First arg is logging level, the rest are the same as print. `lazy` is called only if the
+    message will be printed, its result is printed after the other arguments.
+    """
+    return __level_printf(__check_level(level), lazy, *args, **kwargs)
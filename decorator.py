@@ -16,12 +16,13 @@ def singleton(cls):
     ```
     Reference: https://divyakhatnar.medium.com/singleton-in-python-be59f7698a51
     """
-    instances = {}
+    instance = None
 
     def getinstance(*args, **kwargs):
-        if cls not in instances:
-            instances[cls] = cls(*args, **kwargs)
-        return instances[cls]
+        nonlocal instance
+        if instance is None:
+            instance = cls(*args, **kwargs)
+        return instance
 
     return getinstance
 
@@ -42,9 +43,10 @@ class Singleton(type):
     _instances = {}
 
     def __call__(cls, *args, **kwargs):
-        if cls not in cls._instances:
-            cls._instances[cls] = super().__call__(*args, **kwargs)
-        return cls._instances[cls]
+        instance = cls._instances.get(cls)
+        if instance is None:
+            instance = cls._instances[cls] = super().__call__(*args, **kwargs)
+        return instance
 
 
 def overrides(interface_class):
@@ -8,6 +8,10 @@ import typing
 IS_DEBUG_ENVIRON = "DEBUG"
 NO_COLOR_ENVIRON = "NO_COLOR"
 
+# common values resolved by check_env_true without parsing, consistent with its rules below
+_ENV_TRUE_VALUES = frozenset({"1", "true", "TRUE", "True", "yes", "on"})
+_ENV_FALSE_VALUES = frozenset({"0", ""})
+
 
 def check_env(env: str) -> typing.Optional[str]:
     """
@@ -45,6 +49,10 @@ def check_env_true(env: str) -> bool:
     val = os.environ.get(env, None)
     if val is None:
         return False
+    if val in _ENV_TRUE_VALUES:
+        return True
+    if val in _ENV_FALSE_VALUES:
+        return False
     is_digit = val.isdigit()
     return (is_digit and int(val) != 0) or (not is_digit and len(val) != 0)
 
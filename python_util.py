@@ -4,6 +4,7 @@ Include useful Python utilities that are not part of the standard library.
 
 import os, sys
 import hashlib
+import concurrent.futures
 import typing
 import time
 import datetime
@@ -59,21 +60,60 @@ def safeval(val, default):
     return default
 
 
-def hash_file(algo, path, bufsize=131072):
+# files at least this large are hashed with reads overlapped with hashing, on hosts with more than
+# one CPU (on a single CPU the worker thread cannot run alongside the reads)
+hash_file_pipeline_threshold = 64 * 1048576
+
+
+def _hash_file_pipelined(hs, fin, bufsize):
+    # hs.update releases the GIL on large inputs, so the next readinto on the other buffer runs
+    # while the worker hashes the current one
+    mvs = (memoryview(bytearray(bufsize)), memoryview(bytearray(bufsize)))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        pending = None
+        idx = 0
+        while nbytes := fin.readinto(mvs[idx]):
+            if pending is not None:
+                pending.result()
+            pending = executor.submit(hs.update, mvs[idx][:nbytes])
+            idx ^= 1
+        if pending is not None:
+            pending.result()
+
+
+def hash_file(algo, path, bufsize: typing.Optional[int] = None):
+    """
+    Hash the content of a file.
+    @param algo The hash algorithm name, must be in hashlib.algorithms_available.
+    @param path The path to the file.
+    @param bufsize The read buffer size in bytes, 1 MiB if None. If given, the file is always read
+        with buffers of this size instead of hashlib.file_digest.
+    @return The hex digest of the file content.
+    """
     assert algo in hashlib.algorithms_available, f"Hash algorithm {algo} is not supported"
     assert os.path.isfile(path), f"File \"{path}\" does not exist (Working dir \"{os.getcwd()}\")"
+    pipelined = (
+        os.path.getsize(path) >= hash_file_pipeline_threshold and (os.cpu_count() or 1) > 1
+    )
+    # Python 3.11+, feeds the file to the hash backend without a Python-level loop
+    if not pipelined and bufsize is None and hasattr(hashlib, "file_digest"):
+        with open(path, "rb", buffering=0) as fin:
+            return hashlib.file_digest(fin, algo).hexdigest()
+    bufsize = 1048576 if bufsize is None else bufsize
     hs = hashlib.new(algo)
-    buf = bytearray(bufsize)
-    mv = memoryview(buf)
     with open(path, "rb", buffering=0) as fin:
-        while nbytes := fin.readinto(mv):
-            hs.update(mv[:nbytes])
+        if pipelined:
+            _hash_file_pipelined(hs, fin, bufsize)
+        else:
+            mv = memoryview(bytearray(bufsize))
+            while nbytes := fin.readinto(mv):
+                hs.update(mv[:nbytes])
     return hs.hexdigest()
 
 
 dependency_check_funcs = {
-    "f": lambda s: os.path.isfile(s),
-    "d": lambda s: os.path.isdir(s),
+    "f": os.path.isfile,
+    "d": os.path.isdir,
     "e": lambda s: os.access(s, os.F_OK),
     "r": lambda s: os.access(s, os.R_OK),
     "w": lambda s: os.access(s, os.W_OK),
@@ -89,6 +129,65 @@ def check_dependency(test_type, dependency) -> typing.Optional[str]:
         return os.path.realpath(dependency)
 
 
+# seconds a parsed mount table is reused by find_device_for_path
+mount_table_ttl = 5.0
+_mount_table: typing.Optional[tuple[float, dict[int, typing.Optional[str]]]] = None
+_mount_table_forced_at: typing.Optional[float] = None
+
+
+def _build_mount_table() -> dict[int, typing.Optional[str]]:
+    mount_table = {}
+    with open("/proc/self/mountinfo") as f:
+        for line in f:
+            # "<id> <parent id> <major>:<minor> <root> <mount point> <opts>... - <fs> <source> ..."
+            fields, _, tail = line.partition(" - ")
+            major, _, minor = fields.split(" ", 3)[2].partition(":")
+            target_dev = tail.split(" ", 2)[1]
+            # keep the first mount of a device, as listed by the kernel
+            mount_table.setdefault(os.makedev(int(major), int(minor)), target_dev)
+    return mount_table
+
+
+# mountinfo octal-escapes space, tab, newline and backslash in paths
+_mountinfo_escape_re = re.compile(r"\\([0-7]{3})")
+
+
+def _find_mount_by_stat(dev: int) -> typing.Optional[str]:
+    # for filesystems whose st_dev differs from the mountinfo device number (e.g. btrfs subvolumes)
+    with open("/proc/self/mountinfo") as f:
+        for line in f:
+            fields, _, tail = line.partition(" - ")
+            mount_point = _mountinfo_escape_re.sub(
+                lambda m: chr(int(m.group(1), 8)), fields.split(" ", 5)[4]
+            )
+            try:
+                if os.stat(mount_point).st_dev == dev:
+                    return tail.split(" ", 2)[1]
+            except Exception:
+                continue
+    return None
+
+
+def _get_mount_table(refresh: bool = False) -> tuple[dict[int, typing.Optional[str]], bool]:
+    """
+    Get the cached mount table, rebuilding it once it expires.
+    @param refresh Rebuild the table even if it has not expired, at most once per TTL window.
+    @return The mount table and whether it was rebuilt by this call.
+    """
+    global _mount_table, _mount_table_forced_at
+    now = time.monotonic()
+    # a forced rebuild happens at most once per TTL window
+    forced = refresh and (
+        _mount_table_forced_at is None or now - _mount_table_forced_at > mount_table_ttl
+    )
+    if forced:
+        _mount_table_forced_at = now
+    rebuilt = forced or _mount_table is None or now - _mount_table[0] > mount_table_ttl
+    if rebuilt:
+        _mount_table = (now, _build_mount_table())
+    return _mount_table[1], rebuilt
+
+
 def find_device_for_path(path: str, device_name_only: bool = True) -> typing.Optional[str]:
     path = os.path.realpath(path)
     if not os.path.exists(path):
@@ -96,20 +195,21 @@ def find_device_for_path(path: str, device_name_only: bool = True) -> typing.Opt
     dev = os.stat(path).st_dev
 
     try:
-        with open("/proc/mounts") as f:
-            for line in f:
-                line_split = line.split()
-                target_dev, mount_point, *_ = line_split
-                try:
-                    if os.stat(mount_point).st_dev == dev:
-                        if device_name_only:
-                            return os.path.basename(target_dev)
-                        return target_dev
-                except Exception:
-                    continue
+        mount_table, rebuilt = _get_mount_table()
+        if dev not in mount_table and not rebuilt:
+            # the device may have been mounted after the table was cached
+            mount_table, _ = _get_mount_table(refresh=True)
+        if dev not in mount_table:
+            # remember the result (or the miss) until the table expires
+            mount_table[dev] = _find_mount_by_stat(dev)
+        target_dev = mount_table[dev]
     except FileNotFoundError:
         return None
-    return None
+    if target_dev is None:
+        return None
+    if device_name_only:
+        return os.path.basename(target_dev)
+    return target_dev
 
 
 def display_options(
@@ -137,6 +237,7 @@ def display_options(
         )
         for option in option_list.keys()
     ]
+    message_parts = [message]
     if print_long_descriptions:
         for option, description in option_list_copy.items():
             is_default_option = option == default_option
@@ -144,12 +245,12 @@ def display_options(
             if is_default_option:
                 default_str = default_mark_str
                 option = option.upper() if is_short_format else f"[{option}]"
-            message += (
-                f"\n{default_str:{len(default_mark_str)}s}{option:<{max_opt_len}s}: {description}"
+            message_parts.append(
+                f"{default_str:{len(default_mark_str)}s}{option:<{max_opt_len}s}: {description}"
             )
+        message_parts.append("  Selection")
     display_options_str = print_delimiter.join(display_option_list)
-    message += f"\n  Selection" if print_long_descriptions else ""
-    message += f" ({display_options_str}) ? "
+    message = "\n".join(message_parts) + f" ({display_options_str}) ? "
     repeat_message = f"Invalid selection ({display_options_str}) ? "
     while True:
         selection = input(message).strip().lower()
@@ -196,14 +297,38 @@ def releaseLockFile(locked_file_descriptor):
     locked_file_descriptor.close()
 
 
+# fallback of parse_time for ISO 8601 strings not accepted by datetime.fromisoformat
+iso_time_re = re.compile(r"^(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2}):(\d{2})")
+
+
 # handle time formats like "2025-10-04T11:49:20.880Z"
-def parse_time(time_str: str, format: re.Pattern) -> typing.Optional[time.struct_time]:
+def parse_time(
+    time_str: str, format: typing.Optional[re.Pattern] = None
+) -> typing.Optional[time.struct_time]:
     """
     Parse a time string into a struct_time object.
     @param time_str The time string to parse.
-    @param format The format string to use for parsing.
+    @param format The format string to use for parsing. If None, the time string is parsed as
+        ISO 8601 with datetime.fromisoformat, falling back to iso_time_re. Either way, an invalid
+        date or time (e.g. month 13) gives None.
     @return A struct_time object if parsing is successful, None otherwise.
     """
+    if format is None:
+        try:
+            dt = datetime.datetime.fromisoformat(time_str.rstrip("Z"))
+        except ValueError:
+            # fromisoformat before Python 3.11 rejects some valid ISO 8601 forms, the digits matched
+            # by the fallback are only accepted if they make a valid datetime
+            match = iso_time_re.match(time_str)
+            if not match:
+                return None
+            try:
+                dt = datetime.datetime(*map(int, match.groups()))
+            except ValueError:
+                return None
+        return time.struct_time(
+            (dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second, 0, 0, -1)
+        )
     match = format.match(time_str)
     total_struct_len = 6
     if match and len(match.groups()) <= total_struct_len:
@@ -240,7 +365,7 @@ def parse_iso_time_format(time_str: str) -> typing.Optional[datetime.datetime]:
         return None
 
 
-# this is faster than get_first_word_re in practice for line with date info at the beginning of line
+# this is faster than get_first_word_re in practice, the whitespace scan runs in C
 def get_first_word(line: str) -> str:
     """
     Get the first word from a line.
@@ -248,19 +373,8 @@ def get_first_word(line: str) -> str:
     @param line The input line.
     @return The first word in the line.
     """
-    # raise NotImplementedError()
-    leading_space_end = -1
-    for i, c in enumerate(line):
-        if c.isspace():
-            if leading_space_end < -1:
-                # the space is a leading space, go on
-                continue
-            # the space first seen, perform substring
-            return line[leading_space_end + 1 : i]
-        elif leading_space_end < -1:
-            # encountered first non-space character
-            leading_space_end = i - 1
-    return line[leading_space_end + 1 :]
+    parts = line.split(None, 1)
+    return parts[0] if parts else ""
 
 
 first_word_re = re.compile(r"^\s*(\S+)")
@@ -284,21 +398,10 @@ def get_line_without_first_word(line: str) -> str:
     @param line The input line.
     @return The line without the first word.
     """
-    leading_space_end = -2
-    leading_word_end = -1
-    for i, c in enumerate(line):
-        if c.isspace():
-            if leading_space_end >= -1:
-                leading_word_end = i - 1
-        else:
-            if leading_space_end < -1:
-                leading_space_end = i - 1
-            elif leading_word_end >= 0:
-                return line[i:]
-    return ""
+    parts = line.split(None, 1)
+    return parts[1] if len(parts) == 2 else ""
 
 
-# This is faster than get_line_without_first_word in practice for long lines
 line_without_first_word_re = re.compile(r"^\s*\S+\s(.*\r?\n)")
 
 